@@ -5,25 +5,63 @@ from browser import document, html, window
 # tk_lib.py - This section contains the library classes.
 # =======================================================
 
+# DOM nodes that never change, looked up once instead of per window.
+_BODY = document.body
+_MYWINDOW_CACHE = None
+
+_TWO_PI = 2 * window.Math.PI
+
+_ARIA_TRUE = "true"
+_ARIA_FALSE = "false"
+
+# Source of unique variable names, shared by all Var classes.
+_var_counter = 0
+
+
+def _escape(text):
+    """Escapes text for use in the menu HTML templates."""
+    return (str(text).replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+def _next_var_name():
+    """Returns a short, unique name for a new variable object."""
+    global _var_counter
+    _var_counter += 1
+    return f"var_{_var_counter}"
+
+
+def _get_main_window():
+    """Returns the static #myWindow element, querying the DOM only on first use."""
+    global _MYWINDOW_CACHE
+    if _MYWINDOW_CACHE is None:
+        _MYWINDOW_CACHE = document.select_one('#myWindow')
+    return _MYWINDOW_CACHE
+
+
 class Tk:
     """Represents the main window, styled with 7.css."""
     def __init__(self, title="tk"):
-        self.main_window = document.select_one('#myWindow')
+        self.main_window = _get_main_window()
         self.title_bar_text = self.main_window.select_one('.title-bar-text')
         self.window_body = self.main_window.select_one('.window-body')
 
         self.title = title
         self.title_bar_text.text = self.title
-        self.widgets = []
         
         # This is the fix for the AttributeError.
         # The Tk object's "element" is its body, which is where widgets are attached.
         self.element = self.window_body
+        self._menu_bar = None
+
+    @property
+    def container_element(self):
+        """The element child widgets are packed into."""
+        return self.window_body
         
     def add_widget(self, widget):
         """Adds a widget to the window body."""
         self.window_body.attach(widget.element)
-        self.widgets.append(widget)
 
     def mainloop(self):
         # Brython handles the event loop, so this is just a placeholder
@@ -32,15 +70,30 @@ class Tk:
     def config(self, **kwargs):
         if 'menu' in kwargs:
             menu_bar = kwargs['menu']
-            # Add the menubar as a regular widget to the window body
-            self.add_widget(menu_bar)
+            # Replace any previous menubar rather than stacking a second one
+            if self._menu_bar is not None and self._menu_bar is not menu_bar:
+                self._menu_bar.element.remove()
+            self._menu_bar = menu_bar
+            # Parse the whole menu tree in one go, then put it at the top of the window body
+            menu_bar.render()
+            self.window_body.prepend(menu_bar.element)
 
 
 class Toplevel:
+    # The window currently being dragged; shared by the document-level listeners.
+    _active_dragger = None
+    _drag_listeners_bound = False
+
     def __init__(self, parent, title="toplevel"):
         self.parent = parent
         self.title = title
-        self.widgets = []
+
+        # Dragging state, declared before any listener can touch it.
+        # Toplevel._active_dragger being this window is what "dragging" means.
+        self.offset_x, self.offset_y = 0, 0
+        self._drag_pending = False
+        self._drag_x = self._drag_y = 0
+        self._base_left = self._base_top = 0
 
         self.element = html.DIV(Class="window active", style="position: absolute; top: 100px; left: 100px; min-width: 250px; min-height: 200px; display: flex; flex-direction: column;")
         
@@ -60,39 +113,80 @@ class Toplevel:
         self.element.attach(self.title_bar)
         self.element.attach(self.body)
 
-        document.body.attach(self.element)
+        _BODY.attach(self.element)
 
         # Dragging functionality
-        self.is_dragging = False
-        self.offset_x, self.offset_y = 0, 0
         self.title_bar.bind('mousedown', self.start_drag)
-        self.parent_body = document.select_one('body')
+        if not Toplevel._drag_listeners_bound:
+            document.bind('mousemove', Toplevel._global_mousemove)
+            document.bind('mouseup', Toplevel._global_mouseup)
+            Toplevel._drag_listeners_bound = True
+
+    @property
+    def container_element(self):
+        """The element child widgets are packed into."""
+        return self.body
+
+    @staticmethod
+    def _global_mousemove(event):
+        if Toplevel._active_dragger is not None:
+            Toplevel._active_dragger.do_drag(event)
+
+    @staticmethod
+    def _global_mouseup(event):
+        if Toplevel._active_dragger is not None:
+            Toplevel._active_dragger.stop_drag(event)
 
     def start_drag(self, event):
-        if event.target.tagName == 'BUTTON': return
-        self.is_dragging = True
-        self.element.classList.add('dragging')
-        self.offset_x = event.clientX - self.element.offsetLeft
-        self.offset_y = event.clientY - self.element.offsetTop
-        self.parent_body.bind('mousemove', self.do_drag)
-        self.parent_body.bind('mouseup', self.stop_drag)
+        # Let clicks on interactive controls in the title bar behave normally.
+        if event.target.closest('button, input, select, textarea') is not None:
+            return
+        self.element.classList.toggle('dragging', True)
+        self._base_left = self.element.offsetLeft
+        self._base_top = self.element.offsetTop
+        self.offset_x = event.clientX - self._base_left
+        self.offset_y = event.clientY - self._base_top
+        self._drag_x, self._drag_y = self._base_left, self._base_top
+        # Move on the compositor while dragging; left/top are committed on release.
+        self.element.style.willChange = "transform"
+        Toplevel._active_dragger = self
         
     def do_drag(self, event):
-        if self.is_dragging:
-            self.element.style.left = f"{event.clientX - self.offset_x}px"
-            self.element.style.top = f"{event.clientY - self.offset_y}px"
+        # Only remember the target here; the style write happens once per frame.
+        self._drag_x = event.clientX - self.offset_x
+        self._drag_y = event.clientY - self.offset_y
+        if not self._drag_pending:
+            self._drag_pending = True
+            window.requestAnimationFrame(self._apply_drag)
+
+    def _apply_drag(self, timestamp):
+        self._drag_pending = False
+        if Toplevel._active_dragger is not self:
+            # stop_drag already committed the final position.
+            return
+        dx = self._drag_x - self._base_left
+        dy = self._drag_y - self._base_top
+        self.element.style.transform = f"translate3d({dx}px, {dy}px, 0)"
 
     def stop_drag(self, event):
-        self.is_dragging = False
-        self.element.classList.remove('dragging')
-        self.parent_body.unbind('mousemove', self.do_drag)
-        self.parent_body.unbind('mouseup', self.stop_drag)
+        if Toplevel._active_dragger is not self:
+            return
+        self.element.classList.toggle('dragging', False)
+        self.element.style.left = f"{self._drag_x}px"
+        self.element.style.top = f"{self._drag_y}px"
+        self.element.style.transform = ""
+        self.element.style.willChange = ""
+        Toplevel._active_dragger = None
 
     def add_widget(self, widget):
         self.body.attach(widget.element)
-        self.widgets.append(widget)
 
     def destroy(self, event):
+        # Drop our listeners so the removed window can be garbage collected.
+        if Toplevel._active_dragger is self:
+            Toplevel._active_dragger = None
+        self.close_button.unbind("click")
+        self.title_bar.unbind("mousedown")
         self.element.remove()
 
 class Widget:
@@ -100,17 +194,14 @@ class Widget:
     def __init__(self, parent):
         self.parent = parent
         self.element = None
+
+    @property
+    def container_element(self):
+        """The element child widgets are packed into."""
+        return self.element
     
-    def pack(self, **kwargs):
-        # Determine the correct parent element to attach to.
-        # Use the 'body' attribute for Toplevel and the 'element' for others.
-        if isinstance(self.parent, Toplevel):
-            parent_element = self.parent.body
-        else:
-            parent_element = self.parent.element
-        
-        # Corrected: Remove all layout-related styling from pack method
-        parent_element.attach(self.element)
+    def pack(self):
+        self.parent.container_element.attach(self.element)
 
 class Frame(Widget):
     """A container widget to group other widgets."""
@@ -127,12 +218,28 @@ class Notebook(Widget):
         
         self.element.attach(self.menu)
         self.tabs = {}
+        self._tab_list = []
         self.selected_tab = None
-
-        self.menu.bind("click", self._on_tab_click)
-
-    def add_tab(self, title):
-        """Adds a new tab to the notebook and returns its corresponding panel (a Frame)."""
+        self._selected = None
+        # Buttons and panels are buffered here and flushed in one insertion each.
+        self._pending_buttons = document.createDocumentFragment()
+        self._pending_panels = document.createDocumentFragment()
+        self._flush_scheduled = False
+
+        # A single delegated listener on the container handles every tab button.
+        self.element.bind("click", self._on_tab_click)
+
+    def add_tab(self, title, builder=None):
+        """Adds a new tab to the notebook and returns its corresponding panel (a Frame).
+
+        If builder is given, it is called with the panel the first time the tab
+        is shown, so the tab's widgets are only created when needed.
+
+        New buttons and panels are buffered off-document and inserted on the next
+        animation frame, when the notebook is packed, or on the next tab switch.
+        Until then the panel and anything packed into it are not in the page,
+        so call finalize() first to look them up by id or measure them right away.
+        """
         tab_id = f"tab-{title.lower().replace(' ', '-')}"
         
         # Create the tab button
@@ -141,9 +248,10 @@ class Notebook(Widget):
             title, 
             role="tab", 
             aria_controls=tab_id, 
-            aria_selected=str(is_first_tab).lower()
+            aria_selected=_ARIA_TRUE if is_first_tab else _ARIA_FALSE
         )
-        self.menu.attach(tab_button)
+        tab_button.dataset.idx = str(len(self._tab_list))
+        self._pending_buttons.attach(tab_button)
 
         # Create the tab panel (a Frame) and add it as a sibling to the menu
         tab_panel_frame = Frame(self)
@@ -152,30 +260,78 @@ class Notebook(Widget):
         if not is_first_tab:
             tab_panel_frame.element.hidden = True
 
-        self.element.attach(tab_panel_frame.element)
-        self.tabs[tab_id] = {'button': tab_button, 'panel': tab_panel_frame}
+        self._pending_panels.attach(tab_panel_frame.element)
+        tab = {
+            'id': tab_id,
+            'button': tab_button,
+            'panel': tab_panel_frame,
+            'panel_element': tab_panel_frame.element,
+            'builder': builder,
+        }
+        self.tabs[tab_id] = tab
+        self._tab_list.append(tab)
 
         if is_first_tab:
             self.selected_tab = tab_id
+            self._selected = tab
+            self._build_tab(tab)
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            window.requestAnimationFrame(lambda timestamp: self.finalize())
 
         return tab_panel_frame
 
+    def pack(self):
+        self.finalize()
+        super().pack()
+
+    def finalize(self):
+        """Flushes any buffered tab buttons and panels into the live DOM."""
+        if not self._flush_scheduled:
+            return
+        self._flush_scheduled = False
+        self.menu.attach(self._pending_buttons)
+        self.element.attach(self._pending_panels)
+
+    def _build_tab(self, tab):
+        """Runs a tab's pending builder once."""
+        builder = tab['builder']
+        if builder is not None:
+            tab['builder'] = None
+            builder(tab['panel'])
+
     def _on_tab_click(self, event):
         """Handles the click event for tab buttons."""
-        clicked_button = event.target
-        if clicked_button.tagName == "BUTTON":
-            tab_id = clicked_button.getAttribute("aria-controls")
-            self._select_tab(tab_id)
-
-    def _select_tab(self, tab_id):
+        # Clicks inside panels (including nested notebooks) resolve to a button
+        # outside this notebook's own tablist and are ignored.
+        tab_button = event.target.closest('[role=tab]')
+        if tab_button is None or tab_button.parentElement != self.menu:
+            return
+        self._select_tab(int(tab_button.dataset.idx))
+
+    def _select_tab(self, index):
         """Switches the active tab."""
-        if self.selected_tab:
-            self.tabs[self.selected_tab]['button'].setAttribute('aria-selected', 'false')
-            self.tabs[self.selected_tab]['panel'].element.hidden = True
+        tab = self._tab_list[index]
+        previous = self._selected
+        if previous is tab:
+            return
+        self.finalize()
+        # Build while the panel is still hidden; it is shown in the frame below.
+        self._build_tab(tab)
 
-        self.tabs[tab_id]['button'].setAttribute('aria-selected', 'true')
-        self.tabs[tab_id]['panel'].element.hidden = False
-        self.selected_tab = tab_id
+        self.selected_tab = tab['id']
+        self._selected = tab
+
+        def apply_switch(timestamp):
+            # Deferred to the next frame; old tab is torn down before the new one is shown.
+            if previous:
+                previous['panel_element'].hidden = True
+                previous['button'].setAttribute('aria-selected', _ARIA_FALSE)
+            tab['button'].setAttribute('aria-selected', _ARIA_TRUE)
+            tab['panel_element'].hidden = False
+
+        window.requestAnimationFrame(apply_switch)
 
 
 class Label(Widget):
@@ -211,17 +367,20 @@ class Checkbutton(Widget):
     """A checkbutton widget."""
     def __init__(self, parent, text, variable, command=None, **kwargs):
         super().__init__(parent)
-        
-        self.element = html.DIV()
         self.variable = variable
         self.command = command
+        self.input_element = None
+        self.label_element = None
+
+        self.element = html.DIV()
+        widget_id = f"{variable.name}-{text.replace(' ', '-')}"
 
         self.input_element = html.INPUT(
             type="checkbox", 
-            id=f"{self.variable.name}-{text.replace(' ', '-')}",
+            id=widget_id,
             **kwargs
         )
-        self.label_element = html.LABEL(text, **{'for': f"{self.variable.name}-{text.replace(' ', '-')}"})
+        self.label_element = html.LABEL(text, **{'for': widget_id})
 
         self.element.attach(self.input_element)
         self.element.attach(self.label_element)
@@ -238,19 +397,22 @@ class Radiobutton(Widget):
     """A radiobutton widget."""
     def __init__(self, parent, text, variable, value, command=None, **kwargs):
         super().__init__(parent)
-        self.element = html.DIV()
-        
         self.variable = variable
         self.command = command
+        self.input_element = None
+        self.label_element = None
+
+        self.element = html.DIV()
+        widget_id = f"{variable.name}-{value}"
 
         self.input_element = html.INPUT(
             type="radio",
             name=variable.name,
             value=value,
-            id=f"{variable.name}-{value}",
+            id=widget_id,
             **kwargs
         )
-        self.label_element = html.LABEL(text, **{'for': f"{variable.name}-{value}"})
+        self.label_element = html.LABEL(text, **{'for': widget_id})
 
         self.element.attach(self.input_element)
         self.element.attach(self.label_element)
@@ -274,7 +436,9 @@ class Text(Widget):
         return self.element.value
 
     def insert(self, text):
-        self.element.value += text
+        # Append in place; textLength avoids copying the current value out.
+        end = self.element.textLength
+        self.element.setRangeText(text, end, end, 'end')
 
 class Listbox(Widget):
     """A listbox widget for displaying a list of options."""
@@ -283,16 +447,30 @@ class Listbox(Widget):
         if multiple:
             kwargs['multiple'] = True
         self.element = html.SELECT(**kwargs)
+        # Last result of get(); cleared on the "change" event and on insert().
+        # Selection changes made from script (selectedIndex, option.selected)
+        # fire no event, so call _invalidate() after making them.
+        self._cached = None
+        self.element.bind("change", self._invalidate)
+
+    def _invalidate(self, event=None):
+        self._cached = None
 
     def insert(self, index, item):
         self.element.append(html.OPTION(item))
+        self._invalidate()
     
     def get(self):
-        if self.element.multiple:
-            return [option.text for option in self.element.options if option.selected]
-        else:
-            selected_option = self.element.options[self.element.selectedIndex]
-            return selected_option.text if selected_option else None
+        if self._cached is None:
+            if self.element.multiple:
+                # Cached as a tuple so callers can't mutate it through the result.
+                self._cached = tuple(option.text for option in self.element.options if option.selected)
+            else:
+                selected_option = self.element.options[self.element.selectedIndex]
+                self._cached = selected_option.text if selected_option else None
+        if isinstance(self._cached, tuple):
+            return list(self._cached)
+        return self._cached
 
 class Select(Widget):
     """A dropdown menu widget."""
@@ -326,55 +504,89 @@ class Canvas(Widget):
         self.ctx = self.element.getContext("2d")
         self.width = width
         self.height = height
+        # Last values written to the context, so repeated styles are not re-parsed.
+        self._last_fill = self._last_stroke = self._last_line_width = None
+
+    def reset_style_cache(self):
+        """Call after changing ctx state directly (styles, save/restore, resizing)."""
+        self._last_fill = self._last_stroke = self._last_line_width = None
+
+    def _set_fill(self, fill):
+        if fill != self._last_fill:
+            self.ctx.fillStyle = fill
+            self._last_fill = fill
+
+    def _set_stroke(self, stroke):
+        if stroke != self._last_stroke:
+            self.ctx.strokeStyle = stroke
+            self._last_stroke = stroke
+
+    def _set_line_width(self, width):
+        if width != self._last_line_width:
+            self.ctx.lineWidth = width
+            self._last_line_width = width
 
     def create_rectangle(self, x1, y1, x2, y2, fill="black", outline="black"):
-        self.ctx.fillStyle = fill
-        self.ctx.strokeStyle = outline
+        self._set_fill(fill)
+        self._set_stroke(outline)
         self.ctx.fillRect(x1, y1, x2-x1, y2-y1)
         self.ctx.strokeRect(x1, y1, x2-x1, y2-y1)
 
     def create_oval(self, x1, y1, x2, y2, fill="black", outline="black"):
-        self.ctx.fillStyle = fill
-        self.ctx.strokeStyle = outline
+        self._set_fill(fill)
+        self._set_stroke(outline)
         self.ctx.beginPath()
         # The HTML canvas arcTo function is a bit different, so we'll approximate with ellipse
         # or calculate the control points for a bezier curve.
         # This is a simplified version using arc to draw a circle for now
-        self.ctx.ellipse((x1 + x2) / 2, (y1 + y2) / 2, (x2-x1)/2, (y2-y1)/2, 0, 0, 2 * window.Math.PI)
+        self.ctx.ellipse((x1 + x2) / 2, (y1 + y2) / 2, (x2-x1)/2, (y2-y1)/2, 0, 0, _TWO_PI)
         self.ctx.fill()
         self.ctx.stroke()
 
+    @staticmethod
+    def _svg_path(coords):
+        """Builds an SVG path string ("M x y L x y ...") for a flat coordinate list."""
+        segments = " ".join(f"L{coords[i]} {coords[i+1]}" for i in range(2, len(coords), 2))
+        return f"M{coords[0]} {coords[1]} {segments}"
+
     def create_line(self, *coords, fill="black", width=1):
-        self.ctx.strokeStyle = fill
-        self.ctx.lineWidth = width
-        self.ctx.beginPath()
-        self.ctx.moveTo(coords[0], coords[1])
-        for i in range(2, len(coords), 2):
-            self.ctx.lineTo(coords[i], coords[i+1])
-        self.ctx.stroke()
+        self._set_stroke(fill)
+        self._set_line_width(width)
+        # One Path2D built from a string replaces a lineTo call per point.
+        self.ctx.stroke(window.Path2D.new(self._svg_path(coords)))
+
+    def create_lines_batch(self, paths, fill="black", width=1):
+        """Draws several polylines sharing one style with a single stroke."""
+        self._set_stroke(fill)
+        self._set_line_width(width)
+        svg = " ".join(self._svg_path(coords) for coords in paths)
+        self.ctx.stroke(window.Path2D.new(svg))
 
 class Scale(Widget):
     """A scale widget (slider)."""
     def __init__(self, parent, from_, to, variable=None, command=None, **kwargs):
         super().__init__(parent)
+        self.variable = variable
+        self.command = command
+
         self.element = html.INPUT(
             type="range",
             min=from_,
             max=to,
             **kwargs
         )
-        self.variable = variable
         if self.variable:
             self.element.value = self.variable.get()
-            self.element.bind("input", self._update_variable)
-        
-        if command:
-            self.command = command
-            self.element.bind("input", self.command)
 
-    def _update_variable(self, event):
+        # One listener serves both the variable and the command.
+        if self.variable or self.command:
+            self.element.bind("input", self._on_input)
+
+    def _on_input(self, event):
         if self.variable:
             self.variable.set(self.element.value)
+        if self.command:
+            self.command(event)
     
     def get(self):
         return int(self.element.value)
@@ -383,47 +595,103 @@ class Menubar:
     def __init__(self, parent):
         self.parent = parent
         self.element = html.UL(role="menubar", Class="can-hover")
+        self._menus = []
+        self._commands = {}
+        self._mounted = False
+        # A single delegated listener serves every command in the tree.
+        self.element.bind("click", self._on_click)
     
     def add_menu(self, label, menu_obj):
-        menu_item = html.LI(role="menuitem", tabindex="0", aria_haspopup="true")
-        menu_item.attach(html.SPAN(label))
-        menu_item.attach(menu_obj.element)
-        self.element.attach(menu_item)
+        menu_obj._attach_to(self)
+        self._menus.append((label, menu_obj))
+        self._changed()
+
+    def render(self):
+        """Rebuilds the menubar's contents from a single HTML string."""
+        self._mounted = True
+        commands = {}
+        menus = []
+        self.element.innerHTML = "".join(
+            f'<li role="menuitem" tabindex="0" aria-haspopup="true">'
+            f'<span>{_escape(label)}</span>{menu_obj.render_html(commands, menus)}</li>'
+            for label, menu_obj in self._menus
+        )
+        self._commands = commands
+        for node in self.element.select("[data-menu-id]"):
+            menus[int(node.dataset.menuId)].element = node
+
+    def _changed(self):
+        # Items added after mounting are picked up by re-rendering the tree.
+        if self._mounted:
+            self.render()
+
+    def _on_click(self, event):
+        """Single delegated click handler dispatching on data-command-id."""
+        link = event.target.closest("[data-command-id]")
+        if link is not None:
+            event.preventDefault()
+            self._commands[link.dataset.commandId]()
 
 class Menu:
     def __init__(self, parent):
         self.parent = parent
-        self.element = html.UL(role="menu")
+        # The rendered <ul role="menu">; set each time the owning menubar renders.
+        self.element = None
+        self._items = []
+        self._owner = None
     
     def add_command(self, label, command=None, accelerator=None, **kwargs):
-        item = html.LI(role="menuitem")
-        
-        link = html.A(href="#")
-        link.attach(label)
-        if accelerator:
-            link.attach(html.SPAN(accelerator))
-
-        if command:
-            link.bind("click", lambda event: (event.preventDefault(), command()))
-
-        item.attach(link)
-        self.element.attach(item)
+        self._items.append(("command", label, command, accelerator))
+        self._changed()
     
     def add_separator(self):
-        item = html.LI(Class="has-divider")
-        self.element.attach(item)
+        self._items.append(("separator", None, None, None))
+        self._changed()
 
     def add_cascade(self, label, menu_obj):
-        item = html.LI(role="menuitem", tabindex="0", aria_haspopup="true")
-        item.attach(html.SPAN(label))
-        item.attach(menu_obj.element)
-        self.element.attach(item)
+        menu_obj._attach_to(self)
+        self._items.append(("cascade", label, menu_obj, None))
+        self._changed()
+
+    def _attach_to(self, owner):
+        """Records the menubar or menu this menu was added to, for re-rendering."""
+        self._owner = owner
+
+    def _changed(self):
+        if self._owner is not None:
+            self._owner._changed()
+
+    def render_html(self, commands, menus):
+        """Returns this menu as an HTML string, adding its commands to commands
+        and itself to menus (its index there is its data-menu-id)."""
+        menu_id = len(menus)
+        menus.append(self)
+        parts = []
+        for kind, label, target, accelerator in self._items:
+            if kind == "separator":
+                parts.append('<li class="has-divider"></li>')
+            elif kind == "cascade":
+                parts.append(
+                    f'<li role="menuitem" tabindex="0" aria-haspopup="true">'
+                    f'<span>{_escape(label)}</span>{target.render_html(commands, menus)}</li>'
+                )
+            else:
+                command_attr = ""
+                if target:
+                    command_id = str(len(commands))
+                    commands[command_id] = target
+                    command_attr = f' data-command-id="{command_id}"'
+                shortcut = f"<span>{_escape(accelerator)}</span>" if accelerator else ""
+                parts.append(
+                    f'<li role="menuitem"><a href="#"{command_attr}>{_escape(label)}{shortcut}</a></li>'
+                )
+        return f'<ul role="menu" data-menu-id="{menu_id}">{"".join(parts)}</ul>'
 
 class StringVar:
     """A variable class to hold and track strings."""
     def __init__(self, initial_value=""):
         self._value = initial_value
-        self.name = f"var_{id(self)}"
+        self.name = _next_var_name()
 
     def get(self):
         return self._value
@@ -435,7 +703,7 @@ class IntVar:
     """A variable class to hold and track integers."""
     def __init__(self, initial_value=0):
         self._value = initial_value
-        self.name = f"var_{id(self)}"
+        self.name = _next_var_name()
 
     def get(self):
         return self._value
@@ -447,7 +715,7 @@ class BooleanVar:
     """A variable class to hold and track booleans."""
     def __init__(self, initial_value=False):
         self._value = initial_value
-        self.name = f"var_{id(self)}"
+        self.name = _next_var_name()
 
     def get(self):
         return self._value
@@ -514,155 +782,163 @@ root.config(menu=menubar)
 
 # Create a notebook widget and add it to the main window
 notebook = Notebook(root)
-notebook.pack(expand=True, side="top")
+notebook.pack()
 
-# Create tabs within the notebook
-greetings_tab = notebook.add_tab("Greetings")
-widgets_tab = notebook.add_tab("Widgets")
-new_widgets_tab = notebook.add_tab("New Widgets")
-canvas_tab = notebook.add_tab("Canvas")
-toplevel_tab = notebook.add_tab("Toplevel")
-scale_tab = notebook.add_tab("Scale")
+# Each tab's widgets are built by a function that the notebook calls the
+# first time the tab is shown.
 
 # --- Widgets for the Greetings Tab ---
-greeting_label = Label(greetings_tab, "Hello! Please enter your name below.")
-greeting_label.pack()
-
-name_entry = Entry(greetings_tab)
-name_entry.pack()
-
-def update_greeting(event):
-    """Function to be called when the button is clicked."""
-    name = name_entry.get()
-    if name:
-        greeting_label.config(text=f"Hello, {name}!")
-    else:
-        greeting_label.config(text="Hello there!")
+def build_greetings_tab(greetings_tab):
+    greeting_label = Label(greetings_tab, "Hello! Please enter your name below.")
+    greeting_label.pack()
+
+    name_entry = Entry(greetings_tab)
+    name_entry.pack()
+
+    def update_greeting(event):
+        """Function to be called when the button is clicked."""
+        name = name_entry.get()
+        if name:
+            greeting_label.config(text=f"Hello, {name}!")
+        else:
+            greeting_label.config(text="Hello there!")
 
-greet_button = Button(greetings_tab, "Greet", update_greeting)
-greet_button.pack()
+    greet_button = Button(greetings_tab, "Greet", update_greeting)
+    greet_button.pack()
 
 # --- Widgets for the "Widgets" Tab ---
-header_label = Label(widgets_tab, text="Select your options:")
-header_label.pack()
+def build_widgets_tab(widgets_tab):
+    header_label = Label(widgets_tab, text="Select your options:")
+    header_label.pack()
 
-checkbox_frame = Frame(widgets_tab)
-checkbox_frame.pack()
+    checkbox_frame = Frame(widgets_tab)
+    checkbox_frame.pack()
 
-checkbox_var1 = BooleanVar(initial_value=False)
-def on_checkbox1_toggle(event):
-    print(f"Checkbox 1 state: {checkbox_var1.get()}")
+    checkbox_var1 = BooleanVar(initial_value=False)
+    def on_checkbox1_toggle(event):
+        print(f"Checkbox 1 state: {checkbox_var1.get()}")
 
-checkbox1 = Checkbutton(checkbox_frame, text="Enable Feature X", variable=checkbox_var1, command=on_checkbox1_toggle)
-checkbox1.pack()
+    checkbox1 = Checkbutton(checkbox_frame, text="Enable Feature X", variable=checkbox_var1, command=on_checkbox1_toggle)
+    checkbox1.pack()
 
-checkbox_var2 = BooleanVar(initial_value=False)
-def on_checkbox2_toggle(event):
-    print(f"Checkbox 2 state: {checkbox_var2.get()}")
+    checkbox_var2 = BooleanVar(initial_value=False)
+    def on_checkbox2_toggle(event):
+        print(f"Checkbox 2 state: {checkbox_var2.get()}")
 
-checkbox2 = Checkbutton(checkbox_frame, text="Enable Feature Y", variable=checkbox_var2, command=on_checkbox2_toggle)
-checkbox2.pack()
+    checkbox2 = Checkbutton(checkbox_frame, text="Enable Feature Y", variable=checkbox_var2, command=on_checkbox2_toggle)
+    checkbox2.pack()
 
-radio_frame = Frame(widgets_tab)
-radio_frame.pack()
+    radio_frame = Frame(widgets_tab)
+    radio_frame.pack()
 
-radio_var = StringVar(initial_value="Option A")
-def on_radio_select(event):
-    print(f"Selected option: {radio_var.get()}")
+    radio_var = StringVar(initial_value="Option A")
+    def on_radio_select(event):
+        print(f"Selected option: {radio_var.get()}")
 
-radio1 = Radiobutton(radio_frame, text="Option A", variable=radio_var, value="Option A", command=on_radio_select)
-radio2 = Radiobutton(radio_frame, text="Option B", variable=radio_var, value="Option B", command=on_radio_select)
-radio3 = Radiobutton(radio_frame, text="Option C", variable=radio_var, value="Option C", command=on_radio_select)
+    radio1 = Radiobutton(radio_frame, text="Option A", variable=radio_var, value="Option A", command=on_radio_select)
+    radio2 = Radiobutton(radio_frame, text="Option B", variable=radio_var, value="Option B", command=on_radio_select)
+    radio3 = Radiobutton(radio_frame, text="Option C", variable=radio_var, value="Option C", command=on_radio_select)
 
-radio1.pack()
-radio2.pack()
-radio3.pack()
+    radio1.pack()
+    radio2.pack()
+    radio3.pack()
 
 # --- Widgets for the "New Widgets" Tab ---
-new_widgets_label = Label(new_widgets_tab, "These are some new widgets:")
-new_widgets_label.pack()
+def build_new_widgets_tab(new_widgets_tab):
+    new_widgets_label = Label(new_widgets_tab, "These are some new widgets:")
+    new_widgets_label.pack()
 
-text_widget = Text(new_widgets_tab, placeholder="Type something here...")
-text_widget.pack()
+    text_widget = Text(new_widgets_tab, placeholder="Type something here...")
+    text_widget.pack()
 
-def insert_text(event):
-    text_widget.insert("Hello from the button!\n")
+    def insert_text(event):
+        text_widget.insert("Hello from the button!\n")
 
-insert_button = Button(new_widgets_tab, "Insert Text", insert_text)
-insert_button.pack()
+    insert_button = Button(new_widgets_tab, "Insert Text", insert_text)
+    insert_button.pack()
 
-listbox_label = Label(new_widgets_tab, "Select an item:")
-listbox_label.pack()
+    listbox_label = Label(new_widgets_tab, "Select an item:")
+    listbox_label.pack()
 
-listbox = Listbox(new_widgets_tab)
-listbox.insert(0, "Apple")
-listbox.insert(1, "Banana")
-listbox.insert(2, "Cherry")
-listbox.pack()
+    listbox = Listbox(new_widgets_tab)
+    listbox.insert(0, "Apple")
+    listbox.insert(1, "Banana")
+    listbox.insert(2, "Cherry")
+    listbox.pack()
 
-# Dropdown example
-dropdown_label = Label(new_widgets_tab, "Rate your experience:")
-dropdown_label.pack()
+    # Dropdown example
+    dropdown_label = Label(new_widgets_tab, "Rate your experience:")
+    dropdown_label.pack()
 
-dropdown_options = ["5 - Incredible!", "4 - Great!", "3 - Pretty good", "2 - Not so great", "1 - Unfortunate"]
-dropdown_var = StringVar(initial_value=dropdown_options[0])
+    dropdown_options = ["5 - Incredible!", "4 - Great!", "3 - Pretty good", "2 - Not so great", "1 - Unfortunate"]
+    dropdown_var = StringVar(initial_value=dropdown_options[0])
 
-def on_dropdown_select(event):
-    print(f"Selected rating: {dropdown_var.get()}")
+    def on_dropdown_select(event):
+        print(f"Selected rating: {dropdown_var.get()}")
 
-dropdown = Select(new_widgets_tab, dropdown_options, dropdown_var, command=on_dropdown_select)
-dropdown.pack()
+    dropdown = Select(new_widgets_tab, dropdown_options, dropdown_var, command=on_dropdown_select)
+    dropdown.pack()
 
-# Multi-select listbox example
-multi_listbox_label = Label(new_widgets_tab, "Select multiple fruits:")
-multi_listbox_label.pack()
+    # Multi-select listbox example
+    multi_listbox_label = Label(new_widgets_tab, "Select multiple fruits:")
+    multi_listbox_label.pack()
 
-multi_listbox = Listbox(new_widgets_tab, multiple=True)
-multi_listbox.insert(0, "Apple")
-multi_listbox.insert(1, "Banana")
-multi_listbox.insert(2, "Cherry")
-multi_listbox.insert(3, "Orange")
-multi_listbox.insert(4, "Grape")
-multi_listbox.pack()
+    multi_listbox = Listbox(new_widgets_tab, multiple=True)
+    multi_listbox.insert(0, "Apple")
+    multi_listbox.insert(1, "Banana")
+    multi_listbox.insert(2, "Cherry")
+    multi_listbox.insert(3, "Orange")
+    multi_listbox.insert(4, "Grape")
+    multi_listbox.pack()
 
-def show_selected_items(event):
-    selected_items = multi_listbox.get()
-    print(f"Selected items: {selected_items}")
+    def show_selected_items(event):
+        selected_items = multi_listbox.get()
+        print(f"Selected items: {selected_items}")
 
-show_selected_button = Button(new_widgets_tab, "Show Selected", show_selected_items)
-show_selected_button.pack()
+    show_selected_button = Button(new_widgets_tab, "Show Selected", show_selected_items)
+    show_selected_button.pack()
 
 # --- Widgets for the "Canvas" Tab ---
-canvas_label = Label(canvas_tab, "A simple drawing canvas:")
-canvas_label.pack()
+def build_canvas_tab(canvas_tab):
+    canvas_label = Label(canvas_tab, "A simple drawing canvas:")
+    canvas_label.pack()
 
-drawing_canvas = Canvas(canvas_tab, width=300, height=150, style="border:1px solid black;")
-drawing_canvas.pack()
-
-# Draw some shapes
-drawing_canvas.create_rectangle(10, 10, 60, 60, fill="blue", outline="red")
-drawing_canvas.create_oval(70, 10, 120, 60, fill="green", outline="black")
-drawing_canvas.create_line(130, 10, 180, 60, 130, 60, fill="purple", width=3)
+    drawing_canvas = Canvas(canvas_tab, width=300, height=150, style="border:1px solid black;")
+    drawing_canvas.pack()
 
+    # Draw some shapes
+    drawing_canvas.create_rectangle(10, 10, 60, 60, fill="blue", outline="red")
+    drawing_canvas.create_oval(70, 10, 120, 60, fill="green", outline="black")
+    drawing_canvas.create_line(130, 10, 180, 60, 130, 60, fill="purple", width=3)
 
 # --- Widgets for the "Toplevel" Tab ---
-toplevel_label = Label(toplevel_tab, "Click the button below to open a new window:")
-toplevel_label.pack()
+def build_toplevel_tab(toplevel_tab):
+    toplevel_label = Label(toplevel_tab, "Click the button below to open a new window:")
+    toplevel_label.pack()
 
-open_window_button = Button(toplevel_tab, "Open New Window", lambda event: create_new_window())
-open_window_button.pack()
+    open_window_button = Button(toplevel_tab, "Open New Window", lambda event: create_new_window())
+    open_window_button.pack()
 
 # --- Widgets for the "Scale" Tab ---
-scale_label = Label(scale_tab, "Scale Value: 50")
-scale_label.pack()
+def build_scale_tab(scale_tab):
+    scale_label = Label(scale_tab, "Scale Value: 50")
+    scale_label.pack()
+
+    scale_var = IntVar(initial_value=50)
 
-scale_var = IntVar(initial_value=50)
+    def on_scale_change(event):
+        scale_label.config(text=f"Scale Value: {scale_var.get()}")
 
-def on_scale_change(event):
-    scale_label.config(text=f"Scale Value: {scale_var.get()}")
+    my_scale = Scale(scale_tab, from_=0, to=100, variable=scale_var, command=on_scale_change)
+    my_scale.pack()
 
-my_scale = Scale(scale_tab, from_=0, to=100, variable=scale_var, command=on_scale_change)
-my_scale.pack()
+# Create tabs within the notebook
+notebook.add_tab("Greetings", builder=build_greetings_tab)
+notebook.add_tab("Widgets", builder=build_widgets_tab)
+notebook.add_tab("New Widgets", builder=build_new_widgets_tab)
+notebook.add_tab("Canvas", builder=build_canvas_tab)
+notebook.add_tab("Toplevel", builder=build_toplevel_tab)
+notebook.add_tab("Scale", builder=build_scale_tab)
 
 # Main loop
 root.mainloop()